@@ -1,12 +1,71 @@
 import asyncio
+import hashlib
 import logging
+import random
 import re
+from collections import OrderedDict
 from typing import Optional
 import openai
 from config import Config
 
 logger = logging.getLogger(__name__)
 
+# Replies over the tweet limit are cut here and suffixed with "..."
+_TWEET_TRUNCATE_AT = Config.TWEET_MAX_LENGTH - 3
+
+# Inline markdown/citation patterns stripped by AIClient.clean_response, fused
+# into a single alternation. Order matters: fenced code before inline code.
+# Bold, italic and bold-italic share one group so a run of up to three
+# asterisks is closed by the same run.
+_RE_MARKDOWN = re.compile(
+    r'(?P<footnote>【\d+:\d+†[^】]+】)'
+    r'|(?P<code_block>```[^`]*```)'
+    r'|(?P<emphasis>(?P<stars>\*{1,3})([^*]+)(?P=stars))'
+    r'|(?P<inline_code>`([^`]+)`)'
+    r'|(?P<link>\[([^\]]+)\]\([^)]+\))'
+)
+# Every _RE_MARKDOWN match starts with one of these, so text without any of
+# them can skip the regex pass entirely
+_INLINE_MARKUP_CHARS = ('【', '`', '*', '[')
+_RE_LIST_NUMBER = re.compile(r'\d+\.\s+')
+_RE_WHITESPACE = re.compile(r'\s+')
+
+# Heading, blockquote and bullet markers recognised at the start of a line
+_BLOCK_MARKERS = frozenset('#>-•')
+
+# Groups whose inner text is kept, mapped to the offset of that text's group
+# from the outer one; every other match is dropped entirely
+_UNWRAP_GROUPS = {'emphasis': 2, 'inline_code': 1, 'link': 1}
+
+def _strip_block_markers(line: str) -> str:
+    """Drop leading heading, blockquote, bullet and numbered-list markers from a line."""
+    text = line.lstrip()
+    stripped = False
+    while text:
+        if text[0] in _BLOCK_MARKERS:
+            rest = text.lstrip('#') if text[0] == '#' else text[1:]
+            # A marker must be followed by whitespace, so #hashtags and -5 survive
+            if rest and not rest[0].isspace():
+                break
+            text = rest.lstrip()
+        elif text[0].isdigit():
+            match = _RE_LIST_NUMBER.match(text)
+            if not match:
+                break
+            text = text[match.end():]
+        else:
+            break
+        stripped = True
+    return text if stripped else line
+
+def _strip_markdown(match: re.Match) -> str:
+    offset = _UNWRAP_GROUPS.get(match.lastgroup)
+    if offset:
+        # The wrapped text may itself contain markup (e.g. a list marker in bold)
+        inner = _strip_block_markers(match.group(match.lastindex + offset))
+        return _RE_MARKDOWN.sub(_strip_markdown, inner)
+    return ''
+
 class AIClient:
     def __init__(self):
         # Initialize client with authentication
@@ -14,49 +73,42 @@ class AIClient:
             api_key=Config.OPENAI_API_KEY
         )
         self.assistant_id = Config.ASSISTANT_ID
-        self.poll_interval = 0.5  # Interval to check run status
+        # LRU cache of cleaned responses keyed by a digest of the normalized tweet text
+        self._cache: OrderedDict[bytes, str] = OrderedDict()
         
     def clean_response(self, text: str) -> str:
         """Clean up response text by removing reference notations and formatting"""
         if not text:
             return ""
         
-        # Remove footnotes like【4:0†Alephium recent development IMPORTANT.txt】
-        cleaned = re.sub(r'【\d+:\d+†[^】]+】', '', text)
-        
-        # Remove bold formatting (**text**)
-        cleaned = re.sub(r'\*\*([^*]+)\*\*', r'\1', cleaned)
-        
-        # Remove italic formatting (*text*)
-        cleaned = re.sub(r'\*([^*]+)\*', r'\1', cleaned)
+        # Remove headings, blockquotes, bullets and numbered lists at line starts
+        cleaned = '\n'.join(_strip_block_markers(line) for line in text.split('\n'))
         
-        # Remove numbered lists (1., 2., etc)
-        cleaned = re.sub(r'\d+\.\s+', '', cleaned)
-        
-        # Remove bullet points
-        cleaned = re.sub(r'[-•]\s+', '', cleaned)
-        
-        # Remove code formatting (```text```)
-        cleaned = re.sub(r'```[^`]*```', '', cleaned)
-        
-        # Remove inline code formatting (`text`)
-        cleaned = re.sub(r'`([^`]+)`', r'\1', cleaned)
-        
-        # Remove markdown headings (# text)
-        cleaned = re.sub(r'#+\s+', '', cleaned)
-        
-        # Remove markdown links ([text](url))
-        cleaned = re.sub(r'\[([^\]]+)\]\([^)]+\)', r'\1', cleaned)
-        
-        # Remove blockquotes (> text)
-        cleaned = re.sub(r'>\s+', '', cleaned)
+        # Remove footnotes like【4:0†Alephium recent development IMPORTANT.txt】,
+        # bold/italic, code and links in one pass
+        if any(char in cleaned for char in _INLINE_MARKUP_CHARS):
+            cleaned = _RE_MARKDOWN.sub(_strip_markdown, cleaned)
+            # Asterisks left beside a match (e.g. "***a** b*") were never
+            # rescanned; rescan until nothing more is stripped
+            while '*' in cleaned:
+                rescanned = _RE_MARKDOWN.sub(_strip_markdown, cleaned)
+                if rescanned == cleaned:
+                    break
+                cleaned = rescanned
         
         # Normalize whitespace (including newlines)
-        cleaned = re.sub(r'\s+', ' ', cleaned)
+        cleaned = _RE_WHITESPACE.sub(' ', cleaned)
         
         return cleaned.strip()
         
     async def get_response(self, username: str, tweet_text: str) -> Optional[str]:
+        key = hashlib.blake2b(tweet_text.strip().lower().encode(), digest_size=16).digest()
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            logger.info("Using cached AI response for @%s", username)
+            return cached
+        
         try:
             # Create a new thread with the initial message
             thread = await self.client.beta.threads.create(
@@ -78,7 +130,7 @@ class AIClient:
             run = await self._wait_for_run(thread.id, run.id)
             
             if not run or run.status != 'completed':
-                logger.error(f"Run failed with status: {run.status if run else 'None'}")
+                logger.error("Run failed with status: %s", run.status if run else 'None')
                 return None
             
             # Retrieve the assistant's messages
@@ -90,24 +142,29 @@ class AIClient:
             
             # Get the latest message from the assistant
             if messages.data and messages.data[0].role == "assistant":
-                # Get the text content from the message
-                for content in messages.data[0].content:
-                    if content.type == 'text':
-                        response = content.text.value
-                        # Clean the response
-                        cleaned_response = self.clean_response(response)
-                        # Truncate if longer than tweet limit
-                        if len(cleaned_response) > Config.TWEET_MAX_LENGTH:
-                            cleaned_response = cleaned_response[:Config.TWEET_MAX_LENGTH-3] + "..."
-                        return cleaned_response
+                # Get the first text content block from the message
+                text_block = next((c for c in messages.data[0].content if c.type == 'text'), None)
+                if text_block:
+                    # Clean the response
+                    cleaned_response = self.clean_response(text_block.text.value)
+                    # Truncate if longer than tweet limit
+                    if len(cleaned_response) > Config.TWEET_MAX_LENGTH:
+                        cleaned_response = f"{cleaned_response[:_TWEET_TRUNCATE_AT]}..."
+                    if cleaned_response:
+                        self._cache[key] = cleaned_response
+                        if len(self._cache) > Config.AI_RESPONSE_CACHE_SIZE:
+                            self._cache.popitem(last=False)
+                    return cleaned_response
             
             return None
             
         except Exception as e:
-            logger.error(f"Error getting AI response: {str(e)}")
+            logger.error("Error getting AI response: %s", e)
             return None
             
     async def _wait_for_run(self, thread_id: str, run_id: str) -> Optional[object]:
+        # Poll quickly at first to catch short runs, then back off exponentially
+        delay = Config.RUN_POLL_INITIAL_DELAY
         while True:
             try:
                 run = await self.client.beta.threads.runs.retrieve(
@@ -118,15 +175,16 @@ class AIClient:
                 if run.status == 'completed':
                     return run
                 elif run.status in ['failed', 'expired', 'cancelled']:
-                    logger.error(f"Run failed with status: {run.status}")
+                    logger.error("Run failed with status: %s", run.status)
                     return None
                 elif run.status == 'requires_action':
                     # Handle required actions if needed
                     logger.error("Run requires action - not implemented")
                     return None
                     
-                await asyncio.sleep(self.poll_interval)
+                await asyncio.sleep(delay + random.uniform(0, delay * 0.1))
+                delay = min(delay * Config.RUN_POLL_BACKOFF, Config.RUN_POLL_MAX_DELAY)
                 
             except Exception as e:
-                logger.error(f"Error polling run status: {str(e)}")
+                logger.error("Error polling run status: %s", e)
                 return None
\ No newline at end of file
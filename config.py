@@ -11,6 +11,7 @@ class Config:
     TWITTER_API_SECRET = os.getenv('TWITTER_API_SECRET')
     TWITTER_ACCESS_TOKEN = os.getenv('TWITTER_ACCESS_TOKEN')
     TWITTER_ACCESS_TOKEN_SECRET = os.getenv('TWITTER_ACCESS_TOKEN_SECRET')
+    TWITTER_BEARER_TOKEN = os.getenv('TWITTER_BEARER_TOKEN')  # only needed for the filtered stream
     
     # OpenAI credentials
     OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
@@ -18,13 +19,60 @@ class Config:
     
     # Twitter API settings
     TWITTER_API_BASE_URL = 'https://api.twitter.com/2'
+    HTTP_TIMEOUT = 30.0  # seconds
+    USER_CACHE_TTL = 3600  # seconds to cache user lookups
+    VERIFIED_CACHE_SIZE = 4096  # remembered verified flags, least recently seen evicted
+    GET_CACHE_SIZE = 1024  # cached GET responses
+    METRICS_CACHE_TTL = 60  # seconds
+    THREAD_CACHE_TTL = 86400  # seconds
     
     # Bot settings
     DEFAULT_MENTION_AGE_LIMIT = 180  # minutes
     MAIN_LOOP_DELAY = 250  # seconds
     ERROR_DELAY = 300  # seconds
     MAX_RETRIES = 3
+    BASE_DELAY = 1.0  # seconds, first retry backoff
+    MAX_RETRY_DELAY = 30.0  # seconds
+    MAX_429_WAIT = 900  # seconds, cap on a rate-limit reset wait
+    MAX_TOTAL_WAIT = 1200  # seconds a single request may spend waiting on retries
+    
+    # Twitter v2 user-context rate limits: (requests, window seconds)
+    ENDPOINT_RATE_LIMITS = {
+        'GET /users/me': (75, 900),
+        'GET /users': (900, 900),
+        'GET /users/:id': (900, 900),
+        'GET /users/by': (900, 900),
+        'GET /users/by/username/:username': (900, 900),
+        'GET /users/:id/mentions': (180, 900),
+        'GET /users/:id/tweets': (900, 900),
+        'GET /tweets': (900, 900),
+        'GET /tweets/:id': (900, 900),
+        'GET /tweets/search/recent': (180, 900),
+        'POST /tweets': (200, 900),
+        'POST /users/:id/retweets': (50, 900),
+        'DELETE /users/:id/retweets/:id': (50, 900),
+        'POST /users/:id/likes': (50, 900),
+        'DELETE /users/:id/likes/:id': (50, 900),
+    }
     TWEET_MAX_LENGTH = 280
+    # Seconds to remember a processed tweet. Must outlast every window in which a
+    # tweet can be fetched again (2 hours for accounts, HASHTAG_MAX_AGE for search)
+    # or the bot replies to it twice
+    PROCESSED_TWEET_TTL = 3 * 3600
+    HASHTAG_MAX_AGE = 2 * 3600  # seconds; older search results are ignored
+    MAX_PROCESSED_TWEETS = 10_000
+    STATE_FILE = os.getenv('BOT_STATE_FILE', 'bot_state.json')  # persisted since_id for mentions
+    
+    # Intervals between checks (seconds)
+    MENTIONS_CHECK_INTERVAL = 180  # 3 minutes
+    ACCOUNTS_CHECK_INTERVAL = 900  # 15 minutes
+    HASHTAGS_CHECK_INTERVAL = 1800  # 30 minutes
+    
+    # Assistant run polling (exponential backoff)
+    RUN_POLL_INITIAL_DELAY = 0.25  # seconds
+    RUN_POLL_BACKOFF = 1.7
+    RUN_POLL_MAX_DELAY = 4.0  # seconds
+    AI_RESPONSE_CACHE_SIZE = 512  # cached replies, keyed by normalized tweet text
     
     # New monitoring settings
     ACCOUNTS_TO_MONITOR: List[str] = [
@@ -39,6 +87,11 @@ class Config:
         '#alephium'
     ]
     
+    # Derived once for O(1) membership checks; ALL_ACCOUNTS keeps list order
+    MONITORED_ACCOUNTS = frozenset(ACCOUNTS_TO_MONITOR)
+    RETWEETED_ACCOUNTS = frozenset(ACCOUNTS_TO_RETWEET)
+    ALL_ACCOUNTS = tuple(dict.fromkeys(ACCOUNTS_TO_MONITOR + ACCOUNTS_TO_RETWEET))
+    
     # Thresholds
     MIN_LIKES_THRESHOLD = 25
     
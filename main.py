@@ -1,11 +1,12 @@
 import asyncio
 import logging
 import argparse
-from mention_processor import MentionProcessor
+from mention_processor import MentionProcessor, get_tweet_timestamp
+from rate_limiter import RateLimiter
 from config import Config
-from datetime import datetime, timezone, timedelta
-from collections import deque
+from collections import OrderedDict
 import time
+from typing import Dict, List, Optional
 
 logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -13,32 +14,18 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-class RateLimiter:
-    def __init__(self, requests_per_window: int, window_seconds: int):
-        self.requests_per_window = requests_per_window
-        self.window_seconds = window_seconds
-        self.requests = deque()
-
-    async def acquire(self):
+def is_tweet_recent(tweet: Dict, max_age_minutes: int = 5, now: Optional[float] = None) -> bool:
+    if now is None:
         now = time.time()
-        while self.requests and self.requests[0] <= now - self.window_seconds:
-            self.requests.popleft()
-        
-        if len(self.requests) >= self.requests_per_window:
-            wait_time = self.requests[0] + self.window_seconds - now
-            if wait_time > 0:
-                logger.info(f"Rate limit approached, waiting {wait_time:.2f} seconds")
-                await asyncio.sleep(wait_time)
-        
-        self.requests.append(time.time())
-
-def is_tweet_recent(tweet_created_at: str, max_age_minutes: int = 5) -> bool:
-    tweet_time = datetime.fromisoformat(tweet_created_at.replace('Z', '+00:00'))
-    age = datetime.now(timezone.utc) - tweet_time
-    return age <= timedelta(minutes=max_age_minutes)
+    return now - get_tweet_timestamp(tweet) <= max_age_minutes * 60
 
 # In main.py
 class TwitterBot:
+    __slots__ = (
+        'processor', 'user_tweets_limiter', 'mentions_limiter', 'search_limiter',
+        'retweet_limiter', 'processed_tweets', '_monitored_lower', '_hashtag_queries'
+    )
+
     def __init__(self, processor: MentionProcessor):
         self.processor = processor
         self.user_tweets_limiter = RateLimiter(10, 900)  # 10 requests per 15 minutes
@@ -46,192 +33,168 @@ class TwitterBot:
         self.search_limiter = RateLimiter(5, 900)
         self.retweet_limiter = RateLimiter(3, 900)
         
-        self.processed_tweets = set()
-        self.last_processed_time = {
-            'mentions': 0,
-            'accounts': 0,
-            'hashtags': 0
-        }
+        # Tweet ID -> time it was processed, oldest first
+        self.processed_tweets: OrderedDict[str, float] = OrderedDict()
         
-        # Add minimum intervals between checks
-        self.check_intervals = {
-            'mentions': 180,  # 3 minutes
-            'accounts': 900,  # 15 minutes
-            'hashtags': 1800   # 30 minutes
+        # Invariants used by process_hashtags, computed once
+        self._monitored_lower = frozenset(u.lower() for u in Config.ACCOUNTS_TO_MONITOR)
+        self._hashtag_queries = {
+            hashtag: f"{hashtag} -is:retweet -is:reply lang:en"
+            for hashtag in Config.HASHTAGS_TO_MONITOR
         }
 
-    async def should_process(self, task_type: str) -> bool:
-        current_time = time.time()
-        last_time = self.last_processed_time[task_type]
-        interval = self.check_intervals[task_type]
-        
-        if current_time - last_time < interval:
-            logger.info(f"Skipping {task_type} check - {interval - (current_time - last_time):.0f} seconds until next check")
-            return False
-        return True
-
     async def process_accounts(self):
-        if time.time() - self.last_processed_time['accounts'] < 900:
-            logger.info("Skipping account check - too soon")
-            return
-
         logger.info("Processing accounts...")
-        for username in Config.ACCOUNTS_TO_MONITOR + Config.ACCOUNTS_TO_RETWEET:
-            try:
-                logger.info(f"Checking account: {username}")
-                await self.user_tweets_limiter.acquire()
-                tweets = await self.processor.twitter_client.get_user_tweets(username)
-                
-                if not tweets:
-                    logger.info(f"No recent tweets found for @{username}")
+        # Still one timeline request per account, now resolved by a single
+        # /users/by lookup and fetched concurrently
+        for _ in Config.ALL_ACCOUNTS:
+            await self.user_tweets_limiter.acquire()
+        tweets_by_user = await self.processor.twitter_client.get_many_user_tweets(list(Config.ALL_ACCOUNTS))
+        await asyncio.gather(*[
+            self._process_one_account(username, tweets_by_user.get(username.lower(), []))
+            for username in Config.ALL_ACCOUNTS
+        ])
+
+    async def _process_one_account(self, username: str, tweets: List[Dict]):
+        try:
+            logger.info("Checking account: %s", username)
+            if not tweets:
+                logger.info("No recent tweets found for @%s", username)
+                return
+            
+            two_hours_ago = time.time() - 2 * 3600
+            
+            for tweet in tweets:
+                if tweet['id'] in self.processed_tweets:
                     continue
-                
-                current_time = datetime.now(timezone.utc)
-                two_hours_ago = current_time - timedelta(hours=2)
-                
-                for tweet in tweets:
-                    if tweet['id'] in self.processed_tweets:
-                        continue
-                        
-                    created_at = datetime.fromisoformat(tweet['created_at'].replace('Z', '+00:00'))
-                    if created_at <= two_hours_ago:
-                        logger.info(f"Skipping tweet from @{username} - older than 2 hours")
-                        continue
-                    
-                    # Process all recent tweets from monitored accounts
-                    if username in Config.ACCOUNTS_TO_MONITOR:
-                        logger.info(f"Processing recent tweet from @{username}")
-                        await self.processor.process_mention(tweet)
-                    
-                    if username in Config.ACCOUNTS_TO_RETWEET:
-                        logger.info(f"Retweeting recent tweet from @{username}")
-                        await self.retweet_limiter.acquire()
-                        success = await self.processor.twitter_client.retweet(tweet['id'])
-                        if not success:
-                            logger.warning(f"Failed to retweet tweet {tweet['id']}")
-                    
-                    self.processed_tweets.add(tweet['id'])
                     
-                    await asyncio.sleep(15)
+                if get_tweet_timestamp(tweet) <= two_hours_ago:
+                    logger.info("Skipping tweet from @%s - older than 2 hours", username)
+                    continue
                 
-                await asyncio.sleep(30)
+                # Mark before awaiting so concurrent checks don't pick up the same tweet
+                self.mark_processed(tweet['id'])
                 
-            except Exception as e:
-                logger.error(f"Error processing account {username}: {str(e)}")
-                await asyncio.sleep(30)
-        
-        self.last_processed_time['accounts'] = time.time()
+                # Process all recent tweets from monitored accounts
+                if username in Config.MONITORED_ACCOUNTS:
+                    logger.info("Processing recent tweet from @%s", username)
+                    await self.processor.process_mention(tweet)
+                
+                if username in Config.RETWEETED_ACCOUNTS:
+                    logger.info("Retweeting recent tweet from @%s", username)
+                    await self.retweet_limiter.acquire()
+                    success = await self.processor.twitter_client.retweet(tweet['id'])
+                    if not success:
+                        logger.warning("Failed to retweet tweet %s", tweet['id'])
+            
+        except Exception as e:
+            logger.error("Error processing account %s: %s", username, e)
   
     async def process_mentions(self):
-        if time.time() - self.last_processed_time['mentions'] < 180:
-            logger.info("Skipping mentions check - too soon")
-            return
-
         await self.mentions_limiter.acquire()
         mentions = await self.processor.get_mentions()
-        logger.info(f"Processing {len(mentions)} mentions")
+        logger.info("Processing %d mentions", len(mentions))
         
+        now = time.time()
         for mention in mentions[:3]:
-            if mention['id'] not in self.processed_tweets and is_tweet_recent(mention['created_at']):
+            if mention['id'] not in self.processed_tweets and is_tweet_recent(mention, now=now):
                 await self.processor.process_mention(mention)
-                self.processed_tweets.add(mention['id'])
+                self.mark_processed(mention['id'])
                 await asyncio.sleep(5)
-        
-        self.last_processed_time['mentions'] = time.time()
 
 # The same file as before, but with this specific change in the process_hashtags() function:
 
     async def process_hashtags(self):
-        if time.time() - self.last_processed_time['hashtags'] < 900:
-            logger.info("Skipping hashtag check - too soon")
-            return
-
         logger.info("Processing hashtags...")
-        for hashtag in Config.HASHTAGS_TO_MONITOR:
-            logger.info(f"Checking hashtag: {hashtag}")
+        for hashtag, query in self._hashtag_queries.items():
+            logger.info("Checking hashtag: %s", hashtag)
             await self.search_limiter.acquire()
             
-            query = f"{hashtag} -is:retweet -is:reply lang:en"
             tweets = await self.processor.twitter_client.search_tweets(query)
-            logger.info(f"Found {len(tweets)} tweets with {hashtag}")
+            logger.info("Found %d tweets with %s", len(tweets), hashtag)
             
-            processed_count = 0
-            for tweet in tweets:
-                if tweet['id'] in self.processed_tweets:
-                    continue
-
-                # Skip if tweet is from monitored accounts (already processed)
-                if any(username.lower() in tweet.get('username', '').lower() 
-                    for username in Config.ACCOUNTS_TO_MONITOR):
-                    continue
-
+            # Skip processed tweets, tweets from monitored accounts (already processed)
+            # and tweets too old for processed_tweets to still remember
+            cutoff = time.time() - Config.HASHTAG_MAX_AGE
+            candidates = [
+                tweet for tweet in tweets
+                if tweet['id'] not in self.processed_tweets
+                and (tweet.get('username') or '').lower() not in self._monitored_lower
+                and get_tweet_timestamp(tweet) > cutoff
+            ]
+            if not candidates:
+                continue
+            
+            # Search results normally carry public_metrics; look up any that don't in one batch
+            missing_ids = [tweet['id'] for tweet in candidates if 'public_metrics' not in tweet]
+            if missing_ids:
                 await self.user_tweets_limiter.acquire()
-                metrics = await self.processor.twitter_client.get_tweet_metrics(tweet['id'])
-                
-                if metrics:
-                    like_count = metrics.get('like_count', 0)
-                    logger.info(f"Tweet metrics for {tweet.get('username')}: likes={like_count}")
-
-                    # Only check likes threshold
-                    if like_count >= Config.MIN_LIKES_THRESHOLD:
-                        logger.info(f"Processing tweet with {hashtag} from @{tweet.get('username')} - "
-                                f"meets likes threshold ({like_count} likes)")
-                        await self.processor.process_mention(tweet)
-                        self.processed_tweets.add(tweet['id'])
-                        processed_count += 1
-                    else:
-                        logger.info(f"Skipping tweet from @{tweet.get('username')} - "
-                                f"insufficient likes (needs {Config.MIN_LIKES_THRESHOLD})")
-                
-                if processed_count >= 3:
-                    break
-
-                await asyncio.sleep(10)
+                metrics_map = await self.processor.twitter_client.get_tweets_metrics_batch(missing_ids)
+                for tweet in candidates:
+                    if tweet['id'] in metrics_map:
+                        tweet['public_metrics'] = metrics_map[tweet['id']]
+            
+            popular = []
+            for tweet in candidates:
+                like_count = tweet.get('public_metrics', {}).get('like_count', 0)
+                # Only check likes threshold
+                if like_count >= Config.MIN_LIKES_THRESHOLD:
+                    popular.append((like_count, tweet))
+                else:
+                    logger.info("Skipping tweet from @%s - insufficient likes (%d, needs %d)",
+                                tweet.get('username'), like_count, Config.MIN_LIKES_THRESHOLD)
             
-            await asyncio.sleep(10)
+            # Reply to the three most liked tweets
+            popular.sort(key=lambda item: item[0], reverse=True)
+            for like_count, tweet in popular[:3]:
+                logger.info("Processing tweet with %s from @%s - meets likes threshold (%d likes)",
+                            hashtag, tweet.get('username'), like_count)
+                self.mark_processed(tweet['id'])
+                await self.processor.process_mention(tweet)
         
-        self.last_processed_time['hashtags'] = time.time()
+    def mark_processed(self, tweet_id: str):
+        self.processed_tweets[tweet_id] = time.time()
+        self.processed_tweets.move_to_end(tweet_id)
+        # Cap the size as well so a burst can't grow it unbounded before entries expire
+        if len(self.processed_tweets) > Config.MAX_PROCESSED_TWEETS:
+            self.processed_tweets.popitem(last=False)
+        self.cleanup_processed_tweets()
         
     def cleanup_processed_tweets(self):
-        current_time = time.time()
-        self.processed_tweets = {tweet_id for tweet_id in self.processed_tweets 
-                               if current_time - float(tweet_id) < 3600}
+        # Entries are kept in insertion order, so expired ones are always at the front
+        expiry = time.time() - Config.PROCESSED_TWEET_TTL
+        while self.processed_tweets:
+            tweet_id, processed_at = next(iter(self.processed_tweets.items()))
+            if processed_at >= expiry:
+                break
+            self.processed_tweets.popitem(last=False)
+
+async def _periodic(task, interval: int):
+    """Run a bot check forever, sleeping its own interval between runs."""
+    while True:
+        try:
+            await task()
+        except Exception as e:
+            logger.error("Error in %s: %s", task.__name__, e)
+            await asyncio.sleep(Config.ERROR_DELAY)
+        else:
+            await asyncio.sleep(interval)
 
 async def main(mention_age_limit: int = Config.DEFAULT_MENTION_AGE_LIMIT):
     processor = MentionProcessor(mention_age_limit_minutes=mention_age_limit)
     bot = TwitterBot(processor)
     logger.info("Starting Twitter bot...")
     
-    while True:
-        try:
-            # Process mentions
-            if await bot.should_process('mentions'):
-                logger.info("Checking mentions...")
-                await bot.process_mentions()
-                bot.last_processed_time['mentions'] = time.time()
-            
-            # Process accounts
-            if await bot.should_process('accounts'):
-                logger.info("Checking accounts...")
-                await bot.process_accounts()
-                bot.last_processed_time['accounts'] = time.time()
-            
-            # Process hashtags
-            if await bot.should_process('hashtags'):
-                logger.info("Checking hashtags...")
-                await bot.process_hashtags()
-                bot.last_processed_time['hashtags'] = time.time()
-            
-            # Cleanup processed tweets
-            bot.cleanup_processed_tweets()
-            
-            # Wait a shorter time between checks
-            logger.info("Sleeping for 60 seconds before next check...")
-            await asyncio.sleep(60)
-            
-        except Exception as e:
-            logger.error(f"Error in main loop: {str(e)}")
-            await asyncio.sleep(Config.ERROR_DELAY)
+    # Entering the client resolves the bot's user ID up front and closes the
+    # pooled connections on the way out
+    async with processor.twitter_client:
+        # Each check runs on its own cadence; the rate limiters pace shared endpoints
+        tasks = [
+            asyncio.create_task(_periodic(bot.process_mentions, Config.MENTIONS_CHECK_INTERVAL)),
+            asyncio.create_task(_periodic(bot.process_accounts, Config.ACCOUNTS_CHECK_INTERVAL)),
+            asyncio.create_task(_periodic(bot.process_hashtags, Config.HASHTAGS_CHECK_INTERVAL))
+        ]
+        await asyncio.gather(*tasks)
 
 
 if __name__ == "__main__":
@@ -245,5 +208,5 @@ if __name__ == "__main__":
     except KeyboardInterrupt:
         logger.info("Bot stopped by user")
     except Exception as e:
-        logger.error(f"Bot crashed: {str(e)}")
+        logger.error("Bot crashed: %s", e)
         raise
\ No newline at end of file
@@ -1,25 +1,34 @@
-from datetime import datetime, timezone, timedelta
 import logging
+import time
 from typing import Dict, List, Optional
-from twitter_client import TwitterClient
+from twitter_client import TwitterClient, parse_twitter_timestamp
 from ai_client import AIClient
 from config import Config
 
 logger = logging.getLogger(__name__)
 
+def get_tweet_timestamp(tweet: Dict) -> float:
+    """Return a tweet's created_at as POSIX seconds, parsing it at most once per tweet."""
+    created_ts = tweet.get('created_at_ts')
+    if created_ts is None:
+        created_ts = parse_twitter_timestamp(tweet['created_at'])
+        tweet['created_at_ts'] = created_ts
+    return created_ts
+
 class MentionProcessor:
     def __init__(self, mention_age_limit_minutes: int = Config.DEFAULT_MENTION_AGE_LIMIT):
         self.twitter_client = TwitterClient()
         self.ai_client = AIClient()
         self.mention_age_limit_minutes = mention_age_limit_minutes
         self.user_id = None
-        self.last_mention_id = None
         
     async def initialize(self):
-        """Initialize the processor by getting the user ID and last mention ID."""
+        """Initialize the processor by getting the user ID.
+        
+        The mention since_id is tracked (and persisted) by the Twitter client.
+        """
         if not self.user_id:
             self.user_id = await self.twitter_client.get_user_id()
-            self.last_mention_id = await self.twitter_client._get_latest_mention_id()
             
     async def get_mentions(self) -> List[Dict]:
         await self.initialize()
@@ -32,27 +41,25 @@ class MentionProcessor:
             
             if mentions:
                 filtered_mentions = []
-                now = datetime.now(timezone.utc)
+                now_ts = time.time()
+                max_age_seconds = self.mention_age_limit_minutes * 60
                 
                 for mention in mentions:
-                    created_at_str = mention.get('created_at')
-                    if created_at_str:
-                        created_at = datetime.fromisoformat(created_at_str.replace('Z', '+00:00'))
-                        time_diff = now - created_at
-                        if time_diff <= timedelta(minutes=self.mention_age_limit_minutes):
+                    if mention.get('created_at'):
+                        if now_ts - get_tweet_timestamp(mention) <= max_age_seconds:
                             filtered_mentions.append(mention)
                         else:
-                            logger.info(f"Skipping mention from @{mention.get('username')} older than {self.mention_age_limit_minutes} minutes")
+                            logger.info("Skipping mention from @%s older than %d minutes",
+                                        mention.get('username'), self.mention_age_limit_minutes)
                 
                 if filtered_mentions:
-                    logger.info(f"Found {len(filtered_mentions)} new mentions within the time limit")
-                    self.last_mention_id = filtered_mentions[0]['id']
+                    logger.info("Found %d new mentions within the time limit", len(filtered_mentions))
                     return filtered_mentions
             
             return []
                 
         except Exception as e:
-            logger.error(f"Error getting mentions: {str(e)}")
+            logger.error("Error getting mentions: %s", e)
             return []
             
     async def process_mention(self, mention: Dict) -> None:
@@ -64,16 +71,16 @@ class MentionProcessor:
                     f"user_{mention.get('author_id', 'unknown')}")
             tweet_text = mention['text']
             
-            logger.info(f"Processing mention from @{username}: {tweet_text[:50]}...")
+            logger.info("Processing mention from @%s: %.50s...", username, tweet_text)
             
             response = await self.ai_client.get_response(username, tweet_text)
             if response:
                 if await self.twitter_client.create_tweet(response, tweet_id):
-                    logger.info(f"Successfully replied to @{username}")
+                    logger.info("Successfully replied to @%s", username)
                 else:
-                    logger.error(f"Failed to create reply tweet to @{username}")
+                    logger.error("Failed to create reply tweet to @%s", username)
             else:
-                logger.error(f"Failed to generate response for @{username}")
+                logger.error("Failed to generate response for @%s", username)
                     
         except Exception as e:
-            logger.error(f"Error processing mention: {str(e)}")
\ No newline at end of file
+            logger.error("Error processing mention: %s", e)
\ No newline at end of file
@@ -0,0 +1,34 @@
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+class RateLimiter:
+    """Token bucket allowing requests_per_window requests per window_seconds."""
+    __slots__ = ('capacity', 'rate', 'tokens', 'last')
+
+    def __init__(self, requests_per_window: int, window_seconds: int):
+        self.capacity = requests_per_window
+        self.rate = requests_per_window / window_seconds  # tokens per second
+        self.tokens = float(requests_per_window)
+        self.last = time.monotonic()
+
+    async def acquire(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+        self.last = now
+        
+        # Take the token up front (going negative) so concurrent callers queue up
+        # behind each other instead of all waking for the same token
+        self.tokens -= 1
+        if self.tokens < 0:
+            wait_time = -self.tokens / self.rate
+            logger.info("Rate limit approached, waiting %.2f seconds", wait_time)
+            await asyncio.sleep(wait_time)
+
+    def drain(self):
+        """Empty the bucket, e.g. after the server reports the limit was hit."""
+        now = time.monotonic()
+        self.tokens = min(0.0, self.tokens + (now - self.last) * self.rate)
+        self.last = now
\ No newline at end of file
@@ -1,135 +1,456 @@
 import asyncio
+import base64
+import calendar
+import hashlib
+import hmac
+import json
+import random
+import secrets
 import time
-import math
 import logging
-from typing import Dict, List, Optional
-from requests_oauthlib import OAuth1Session
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import httpx
 from config import Config
-from datetime import datetime, timezone, timedelta
+from rate_limiter import RateLimiter
+from datetime import datetime
+from urllib.parse import quote
 
 logger = logging.getLogger(__name__)
 
+# orjson is an optional, faster drop-in for encoding/decoding API payloads
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+def parse_twitter_timestamp(created_at: str) -> float:
+    """Convert a v2 API timestamp (YYYY-MM-DDTHH:MM:SS.sssZ) to POSIX seconds."""
+    if len(created_at) >= 19 and created_at[10] == 'T':
+        # Sub-seconds are ignored; the fixed layout lets us slice instead of parse
+        return calendar.timegm((
+            int(created_at[0:4]), int(created_at[5:7]), int(created_at[8:10]),
+            int(created_at[11:13]), int(created_at[14:16]), int(created_at[17:19]),
+            0, 0, 0
+        ))
+    return datetime.fromisoformat(created_at.replace('Z', '+00:00')).timestamp()
+
+# Fixed request parameters, shared rather than rebuilt on every call. Treat as
+# read-only; copy before adding per-call keys.
+_METRICS_PARAMS = {'tweet.fields': 'public_metrics,referenced_tweets'}
+_THREAD_PARAMS = {'tweet.fields': 'conversation_id'}
+_MENTIONS_PARAMS = {
+    'tweet.fields': 'author_id,created_at,text,conversation_id',
+    'expansions': 'author_id',
+    'user.fields': 'username,verified'
+}
+_USER_TWEETS_PARAMS = {
+    'tweet.fields': 'public_metrics,created_at,conversation_id',
+    'exclude': 'retweets,replies'
+}
+_SEARCH_PARAMS = {
+    'tweet.fields': 'public_metrics,created_at,author_id,conversation_id',
+    'expansions': 'author_id',
+    'user.fields': 'username,verified'
+}
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
+def _endpoint_family(method: str, endpoint: str) -> str:
+    """Map a request to its rate-limit family, e.g. 'GET /users/:id/mentions'."""
+    parts = endpoint.split('/')
+    if endpoint.startswith('/users/by/username/'):
+        parts[-1] = ':username'
+    return f"{method} " + '/'.join(':id' if part.isdigit() else part for part in parts)
+
+def _get_cache_ttl(endpoint: str, params: Optional[Dict]) -> float:
+    """Seconds a GET response may be reused for; 0 means don't cache."""
+    params = params or {}
+    if endpoint.startswith('/users/by'):
+        # Username -> user is effectively static
+        return Config.USER_CACHE_TTL
+    if endpoint.startswith('/users') and endpoint.count('/') <= 2 and 'verified' in params.get('user.fields', ''):
+        # User lookups (/users, /users/{id}); not timelines like /users/{id}/mentions
+        return Config.USER_CACHE_TTL
+    if endpoint.startswith('/tweets') and not endpoint.startswith('/tweets/search'):
+        tweet_fields = params.get('tweet.fields', '')
+        if 'public_metrics' in tweet_fields:
+            return Config.METRICS_CACHE_TTL
+        if 'conversation_id' in tweet_fields:
+            # A tweet's conversation never changes
+            return Config.THREAD_CACHE_TTL
+    return 0
+
+def _oauth_escape(value: str) -> str:
+    """RFC 3986 percent-encoding as required by OAuth 1.0a."""
+    return quote(value, safe='~')
+
+class OAuth1Auth(httpx.Auth):
+    """Signs httpx requests with OAuth 1.0a user-context credentials (HMAC-SHA1)."""
+    def __init__(self, client_key: str, client_secret: str, resource_owner_key: str, resource_owner_secret: str):
+        self.client_key = client_key
+        self.resource_owner_key = resource_owner_key
+        # The HMAC key depends only on the secrets, so build it once
+        self._signing_key = f"{_oauth_escape(client_secret or '')}&{_oauth_escape(resource_owner_secret or '')}".encode()
+
+    def auth_flow(self, request: httpx.Request):
+        request.headers['Authorization'] = self._authorization(
+            request.method, request.url, secrets.token_hex(16), str(int(time.time()))
+        )
+        yield request
+
+    def _authorization(self, method: str, url: httpx.URL, nonce: str, timestamp: str) -> str:
+        oauth_params = {
+            'oauth_consumer_key': self.client_key,
+            'oauth_nonce': nonce,
+            'oauth_signature_method': 'HMAC-SHA1',
+            'oauth_timestamp': timestamp,
+            'oauth_token': self.resource_owner_key,
+            'oauth_version': '1.0'
+        }
+        
+        # Only the URL (including query params) is signed; JSON bodies are not
+        # part of the OAuth 1.0a signature base string
+        pairs = sorted(
+            (_oauth_escape(k), _oauth_escape(v))
+            for k, v in (*url.params.multi_items(), *oauth_params.items())
+        )
+        normalized_params = '&'.join(f"{k}={v}" for k, v in pairs)
+        port = f":{url.port}" if url.port else ''
+        base_url = f"{url.scheme}://{url.host}{port}{url.raw_path.split(b'?', 1)[0].decode()}"
+        base_string = '&'.join((method.upper(), _oauth_escape(base_url), _oauth_escape(normalized_params)))
+        
+        signature = base64.b64encode(hmac.new(self._signing_key, base_string.encode(), hashlib.sha1).digest()).decode()
+        oauth_params['oauth_signature'] = signature
+        return 'OAuth ' + ', '.join(f'{k}="{_oauth_escape(v)}"' for k, v in oauth_params.items())
+
 class TwitterClient:
     def __init__(self):
-        self.oauth = OAuth1Session(
-            Config.TWITTER_API_KEY,
-            client_secret=Config.TWITTER_API_SECRET,
-            resource_owner_key=Config.TWITTER_ACCESS_TOKEN,
-            resource_owner_secret=Config.TWITTER_ACCESS_TOKEN_SECRET
+        # One pooled client for the process so TCP/TLS connections are reused;
+        # over HTTP/2 concurrent requests share a single connection. With Brotli
+        # installed httpx also advertises br next to gzip/deflate on its own
+        self._client = httpx.AsyncClient(
+            base_url=Config.TWITTER_API_BASE_URL,
+            http2=True,
+            auth=OAuth1Auth(
+                Config.TWITTER_API_KEY,
+                Config.TWITTER_API_SECRET,
+                Config.TWITTER_ACCESS_TOKEN,
+                Config.TWITTER_ACCESS_TOKEN_SECRET
+            ),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            timeout=Config.HTTP_TIMEOUT
         )
         self.base_url = Config.TWITTER_API_BASE_URL
         self.user_id = None
+        # Endpoints under the authenticated user, set once get_user_id resolves it
+        self._ep_mentions: Optional[str] = None
+        self._ep_retweets: Optional[str] = None
+        self._ep_likes: Optional[str] = None
+        # Newest mention seen, persisted so a restart resumes polling from it
+        self._state_path = Path(Config.STATE_FILE)
+        self._last_mention_id: Optional[str] = self._load_state().get('last_mention_id')
+        # User ID -> newest tweet ID seen, for incremental timeline polls
+        self._last_tweet_ids: Dict[str, str] = {}
+        # (endpoint, sorted params) -> (fetched at, raw response body) for cacheable
+        # GETs; kept as bytes so callers that modify a payload can't alter the cache
+        self._get_cache: OrderedDict[Tuple, Tuple[float, bytes]] = OrderedDict()
+        self._user_id_future: Optional[asyncio.Future] = None
+        # Lowercased username -> (fetched at, user ID)
+        self._username_cache: Dict[str, Tuple[float, str]] = {}
+        self._username_futures: Dict[str, asyncio.Future] = {}
+        # User ID -> (seen at, verified), seeded from author expansions and lookups
+        self._verified_cache: OrderedDict[str, Tuple[float, bool]] = OrderedDict()
+        # Client-side token buckets per endpoint family (see Config.ENDPOINT_RATE_LIMITS)
+        self._buckets = {
+            family: RateLimiter(requests, window)
+            for family, (requests, window) in Config.ENDPOINT_RATE_LIMITS.items()
+        }
 
-    async def _make_request(self, method: str, endpoint: str, params: Dict = None, data: Dict = None, headers: Dict = None, retry_count: int = 0) -> Optional[Dict]:
-        
+    def _load_state(self) -> Dict:
+        """Read the persisted polling state, or {} if there is none yet."""
         try:
-            url = f"{self.base_url}{endpoint}"
-            
-            if method.upper() == 'GET':
-                response = self.oauth.get(url, params=params, headers=headers)
-            elif method.upper() == 'POST':
-                response = self.oauth.post(url, json=data, headers=headers)
-            else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
-            
-            if response.status_code == 429:
-                reset_time = int(response.headers.get('x-rate-limit-reset', time.time() + 900))
-                current_time = time.time()
-                sleep_time = max(reset_time - current_time, 60)
-                logger.warning(f"Rate limit exceeded. Sleeping for {sleep_time} seconds.")
-                await asyncio.sleep(sleep_time)
-                return await self._make_request(method, endpoint, params, data, headers)
-            
-            response.raise_for_status()
-            return response.json()
-            
-        except Exception as e:
-            logger.error(f"Error in API request: {str(e)}")
-            if retry_count < Config.MAX_RETRIES:
-                sleep_time = math.pow(2, retry_count)
-                logger.info(f"Retrying after {sleep_time} seconds...")
+            state = _json_loads(self._state_path.read_bytes())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable state file %s: %s", self._state_path, e)
+            return {}
+        if not isinstance(state, dict):
+            logger.warning("Ignoring state file %s: expected a JSON object", self._state_path)
+            return {}
+        # A bad since_id would make every mentions poll fail, so drop it instead
+        last_mention_id = state.get('last_mention_id')
+        is_valid = isinstance(last_mention_id, str) and last_mention_id.isascii() and last_mention_id.isdigit()
+        if last_mention_id is not None and not is_valid:
+            logger.warning("Ignoring invalid last_mention_id %r in %s", last_mention_id, self._state_path)
+            del state['last_mention_id']
+        return state
+
+    async def _save_state(self):
+        """Write the polling state without blocking the event loop."""
+        state = _json_dumps({'last_mention_id': self._last_mention_id})
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, self._state_path.write_bytes, state)
+        except OSError as e:
+            logger.error("Error saving state to %s: %s", self._state_path, e)
+
+    async def close(self):
+        """Close the pooled HTTP connections."""
+        await self._client.aclose()
+
+    async def prefetch(self):
+        """Resolve the authenticated user's ID up front so later calls skip that round-trip."""
+        await self.get_user_id()
+
+    async def __aenter__(self):
+        await self.prefetch()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def _make_request(self, method: str, endpoint: str, params: Dict = None, data: Dict = None, headers: Dict = None) -> Optional[Dict]:
+        retry_count = 0
+        # Give up rather than wait past this, however the time was spent
+        deadline = time.monotonic() + Config.MAX_TOTAL_WAIT
+        
+        # Serve repeat reads of slow-changing resources from the cache
+        cache_key = None
+        cache_ttl = _get_cache_ttl(endpoint, params) if method.upper() == 'GET' else 0
+        if cache_ttl:
+            cache_key = (endpoint, tuple(sorted((params or {}).items())))
+            cached = self._get_cache.get(cache_key)
+            if cached and time.time() - cached[0] < cache_ttl:
+                self._get_cache.move_to_end(cache_key)
+                return _json_loads(cached[1])
+        
+        # Stay under Twitter's per-endpoint window instead of waiting to be told off
+        bucket = self._buckets.get(_endpoint_family(method.upper(), endpoint))
+        
+        # Serialize JSON bodies ourselves so the faster encoder is used
+        content = None
+        if data is not None:
+            content = _json_dumps(data)
+            headers = _JSON_HEADERS if headers is None else {**_JSON_HEADERS, **headers}
+        
+        while True:
+            try:
+                if bucket:
+                    await bucket.acquire()
+                response = await self._client.request(method.upper(), endpoint, params=params, content=content, headers=headers)
+                
+                if response.status_code == 429:
+                    # Our bucket was out of sync with the server's count
+                    if bucket:
+                        bucket.drain()
+                    sleep_time = self._compute_429_sleep(response)
+                    if time.monotonic() + sleep_time > deadline:
+                        logger.error("Rate limit exceeded and reset is too far away; giving up on %s", endpoint)
+                        return None
+                    logger.warning("Rate limit exceeded. Sleeping for %.0f seconds.", sleep_time)
+                    await asyncio.sleep(sleep_time)
+                    continue
+                
+                response.raise_for_status()
+                # A successful response may have no body (e.g. some DELETEs); that's
+                # still a success, not a decode error to retry
+                if not response.content:
+                    return {'data': {}}
+                result = _json_loads(response.content)
+                if cache_key:
+                    self._get_cache[cache_key] = (time.time(), response.content)
+                    self._get_cache.move_to_end(cache_key)
+                    if len(self._get_cache) > Config.GET_CACHE_SIZE:
+                        self._get_cache.popitem(last=False)
+                return result
+                
+            except Exception as e:
+                logger.error("Error in API request: %s", e)
+                if retry_count >= Config.MAX_RETRIES:
+                    return None
+                sleep_time = self._backoff(retry_count)
+                if time.monotonic() + sleep_time > deadline:
+                    return None
+                logger.info("Retrying after %.1f seconds...", sleep_time)
                 await asyncio.sleep(sleep_time)
-                return await self._make_request(method, endpoint, params, data, headers, retry_count + 1)
-            return None
+                retry_count += 1
+
+    async def _request_full(self, method: str, endpoint: str, **kwargs) -> Optional[Dict]:
+        """Make a request and return the whole payload, or None if it carries no data.
+        
+        For endpoints whose expansions come back under 'includes'.
+        """
+        response = await self._make_request(method, endpoint, **kwargs)
+        return response if response and 'data' in response else None
+
+    async def _request_data(self, method: str, endpoint: str, **kwargs) -> Optional[Any]:
+        """Make a request and return just its 'data' member, or None on failure."""
+        response = await self._make_request(method, endpoint, **kwargs)
+        return response.get('data') if response else None
+
+    @staticmethod
+    def _compute_429_sleep(response: httpx.Response) -> float:
+        """Seconds to wait after a 429, based on the rate-limit reset header."""
+        reset_time = int(response.headers.get('x-rate-limit-reset', time.time() + 900))
+        sleep_time = min(max(reset_time - time.time(), 60), Config.MAX_429_WAIT)
+        # Jitter so coroutines waiting on the same reset don't all retry at once
+        return sleep_time + random.uniform(0, 5)
+
+    @staticmethod
+    def _backoff(retry_count: int) -> float:
+        """Full-jitter exponential backoff, capped, so concurrent retries spread out."""
+        return min(Config.MAX_RETRY_DELAY,
+                   random.uniform(1.0, Config.BASE_DELAY * (2 ** retry_count) * 1.5))
 
     async def get_user_id(self) -> Optional[str]:
         """Get the authenticated user's ID."""
         if self.user_id:
             return self.user_id
-            
-        response = await self._make_request('GET', '/users/me')
-        if response and 'data' in response:
-            self.user_id = response['data']['id']
-            return self.user_id
-        return None
+        
+        # Concurrent callers share the lookup already in flight
+        if self._user_id_future is not None:
+            return await self._user_id_future
+        
+        future = self._user_id_future = asyncio.get_running_loop().create_future()
+        try:
+            data = await self._request_data('GET', '/users/me')
+            if data:
+                user_id = data['id']
+                self._ep_mentions = f'/users/{user_id}/mentions'
+                self._ep_retweets = f'/users/{user_id}/retweets'
+                self._ep_likes = f'/users/{user_id}/likes'
+                self.user_id = user_id
+        finally:
+            future.set_result(self.user_id)
+            self._user_id_future = None
+        return self.user_id
 
     async def get_user_id_by_username(self, username: str) -> Optional[str]:
         """Get a user's ID by their username."""
+        key = username.lower()
+        cached = self._username_cache.get(key)
+        if cached and time.time() - cached[0] < Config.USER_CACHE_TTL:
+            return cached[1]
+        
+        pending = self._username_futures.get(key)
+        if pending is not None:
+            return await pending
+        
+        future = self._username_futures[key] = asyncio.get_running_loop().create_future()
+        user_id = None
         try:
-            response = await self._make_request('GET', f'/users/by/username/{username}')
-            return response.get('data', {}).get('id') if response else None
+            data = await self._request_data('GET', f'/users/by/username/{username}')
+            user_id = data.get('id') if data else None
+            if user_id:
+                self._username_cache[key] = (time.time(), user_id)
+            return user_id
         except Exception as e:
-            logger.error(f"Error getting user ID for username {username}: {str(e)}")
+            logger.error("Error getting user ID for username %s: %s", username, e)
             return None
+        finally:
+            future.set_result(user_id)
+            del self._username_futures[key]
 
-    async def is_user_verified(self, user_id: str) -> bool:
-        """Check if a user is verified."""
+    async def get_user_ids_by_usernames(self, usernames: List[str]) -> Dict[str, str]:
+        """Get user IDs for many usernames, keyed by lowercased username (100 per request)."""
+        user_ids = {}
+        missing = []
+        now = time.time()
+        for username in usernames:
+            key = username.lower()
+            cached = self._username_cache.get(key)
+            if cached and now - cached[0] < Config.USER_CACHE_TTL:
+                user_ids[key] = cached[1]
+            else:
+                missing.append(username)
+        
         try:
-            params = {
-                'user.fields': 'verified'
-            }
-            response = await self._make_request('GET', f'/users/{user_id}', params=params)
-            return response.get('data', {}).get('verified', False) if response else False
+            for start in range(0, len(missing), 100):
+                params = {'usernames': ','.join(missing[start:start + 100])}
+                for user in await self._request_data('GET', '/users/by', params=params) or ():
+                    key = user['username'].lower()
+                    user_ids[key] = user['id']
+                    self._username_cache[key] = (time.time(), user['id'])
+            return user_ids
         except Exception as e:
-            logger.error(f"Error checking user verification: {str(e)}")
-            return False
+            logger.error("Error getting user IDs for usernames: %s", e)
+            return user_ids
+
+    async def get_users_verified_bulk(self, user_ids: List[str]) -> Dict[str, bool]:
+        """Check verification for many users, keyed by user ID (100 per request)."""
+        verified = {}
+        try:
+            for start in range(0, len(user_ids), 100):
+                params = {
+                    'ids': ','.join(user_ids[start:start + 100]),
+                    'user.fields': 'verified'
+                }
+                now = time.time()
+                for user in await self._request_data('GET', '/users', params=params) or ():
+                    verified[user['id']] = user.get('verified', False)
+                    self._remember_verified(user['id'], verified[user['id']], now)
+            return verified
+        except Exception as e:
+            logger.error("Error checking user verification in bulk: %s", e)
+            return verified
+
+    async def is_user_verified(self, user_id: str) -> bool:
+        """Check if a user is verified.
+        
+        Answers from the verified flags already seen in mention, search and
+        user lookups when fresh, and only asks /users?ids= otherwise.
+        """
+        cached = self._verified_cache.get(user_id)
+        if cached and time.time() - cached[0] < Config.USER_CACHE_TTL:
+            return cached[1]
+        
+        verified = await self.get_users_verified_bulk([user_id])
+        return verified.get(user_id, False)
+
+    def _remember_verified(self, user_id: str, verified: bool, now: float):
+        self._verified_cache[user_id] = (now, verified)
+        self._verified_cache.move_to_end(user_id)
+        if len(self._verified_cache) > Config.VERIFIED_CACHE_SIZE:
+            self._verified_cache.popitem(last=False)
 
     async def get_tweet_metrics(self, tweet_id: str) -> Optional[Dict]:
         """Get engagement metrics for a tweet."""
         try:
-            params = {
-                'tweet.fields': 'public_metrics,referenced_tweets'
-            }
-            response = await self._make_request('GET', f'/tweets/{tweet_id}', params=params)
-            return response.get('data', {}).get('public_metrics') if response else None
+            data = await self._request_data('GET', f'/tweets/{tweet_id}', params=_METRICS_PARAMS)
+            return data.get('public_metrics') if data else None
         except Exception as e:
-            logger.error(f"Error getting tweet metrics: {str(e)}")
+            logger.error("Error getting tweet metrics: %s", e)
             return None
 
-    async def get_tweet_thread(self, tweet_id: str) -> Optional[str]:
-        """Get the conversation ID for a tweet."""
+    async def get_tweets_metrics_batch(self, tweet_ids: List[str]) -> Dict[str, Dict]:
+        """Get engagement metrics for many tweets, keyed by tweet ID (100 IDs per request)."""
+        metrics = {}
         try:
-            params = {
-                'tweet.fields': 'conversation_id'
-            }
-            response = await self._make_request('GET', f'/tweets/{tweet_id}', params=params)
-            return response.get('data', {}).get('conversation_id') if response else None
+            for start in range(0, len(tweet_ids), 100):
+                params = {
+                    'ids': ','.join(tweet_ids[start:start + 100]),
+                    'tweet.fields': 'public_metrics'
+                }
+                for tweet in await self._request_data('GET', '/tweets', params=params) or ():
+                    if 'public_metrics' in tweet:
+                        metrics[tweet['id']] = tweet['public_metrics']
+            return metrics
         except Exception as e:
-            logger.error(f"Error getting tweet thread: {str(e)}")
-            return None
-    
-    async def _get_latest_mention_id(self) -> Optional[str]:
-        """Get the ID of the most recent mention."""
+            logger.error("Error getting tweet metrics batch: %s", e)
+            return metrics
+
+    async def get_tweet_thread(self, tweet_id: str) -> Optional[str]:
+        """Get the conversation ID for a tweet."""
         try:
-            params = {
-                'max_results': 5,
-                'tweet.fields': 'created_at,id'
-            }
-            
-            user_id = await self.get_user_id()
-            if not user_id:
-                logger.error("Could not get user ID")
-                return None
-                
-            response = await self._make_request('GET', f'/users/{user_id}/mentions', params=params)
-            if response and 'data' in response and len(response['data']) > 0:
-                return response['data'][0]['id']
-            
-            logger.info("No previous mentions found")
-            return None
-            
+            data = await self._request_data('GET', f'/tweets/{tweet_id}', params=_THREAD_PARAMS)
+            return data.get('conversation_id') if data else None
         except Exception as e:
-            logger.error(f"Error getting latest mention ID: {str(e)}")
+            logger.error("Error getting tweet thread: %s", e)
             return None
     
     async def create_tweet(self, text: str, reply_to: str = None) -> bool:
@@ -138,196 +459,233 @@ class TwitterClient:
             if reply_to:
                 data['reply'] = {'in_reply_to_tweet_id': reply_to}
             
-            headers = {'Content-Type': 'application/json'}
-            response = await self._make_request('POST', '/tweets', data=data, headers=headers)
-            return bool(response and 'data' in response)
+            return await self._request_data('POST', '/tweets', data=data, headers=_JSON_HEADERS) is not None
             
         except Exception as e:
-            logger.error(f"Error creating tweet: {str(e)}")
+            logger.error("Error creating tweet: %s", e)
             return False
         
     async def retweet(self, tweet_id: str) -> bool:
         """Retweet a specific tweet."""
         try:
-            user_id = await self.get_user_id()
-            if not user_id:
+            if not await self.get_user_id():
                 return False
                 
             data = {
                 'tweet_id': tweet_id
             }
             
-            # Create proper endpoint with tweet_id in the body
-            endpoint = f'/users/{user_id}/retweets'
-            response = await self._make_request('POST', endpoint, data=data)
+            # The tweet to retweet goes in the body, not the endpoint
+            response = await self._make_request('POST', self._ep_retweets, data=data)
             
             if response and 'data' in response:
-                logger.info(f"Successfully retweeted tweet {tweet_id}")
+                logger.info("Successfully retweeted tweet %s", tweet_id)
                 return True
             elif response and 'errors' in response:
-                logger.error(f"Failed to retweet {tweet_id}: {response['errors']}")
+                logger.error("Failed to retweet %s: %s", tweet_id, response['errors'])
                 return False
                 
             return False
         except Exception as e:
-            logger.error(f"Error retweeting: {str(e)}")
+            logger.error("Error retweeting: %s", e)
             return False
 
     async def unretweet(self, tweet_id: str) -> bool:
         """Remove a retweet."""
         try:
-            user_id = await self.get_user_id()
-            if not user_id:
+            if not await self.get_user_id():
                 return False
                 
-            response = await self._make_request('DELETE', f'/users/{user_id}/retweets/{tweet_id}')
-            return bool(response and 'data' in response)
+            return await self._request_data('DELETE', self._ep_retweets + '/' + tweet_id) is not None
         except Exception as e:
-            logger.error(f"Error removing retweet: {str(e)}")
+            logger.error("Error removing retweet: %s", e)
             return False
             
-    async def get_mentions(self) -> List[Dict]:
-        """Get recent mentions of the authenticated user (limited to last 3)."""
+    def _attach_authors(self, tweets: List[Dict], response: Dict):
+        """Copy username/verified from the author_id expansion onto each tweet."""
+        users = {user['id']: user for user in response.get('includes', {}).get('users', ())}
+        if not users:
+            return
+        # The expansion already tells us who is verified; remember it for is_user_verified
+        now = time.time()
+        for user_id, user in users.items():
+            self._remember_verified(user_id, user.get('verified', False), now)
+        for tweet in tweets:
+            user = users.get(tweet['author_id'])
+            tweet['username'] = user['username'] if user else None
+            tweet['verified'] = user.get('verified', False) if user else False
+
+    async def get_mentions(self, max_results: int = 100, since_id: Optional[str] = None) -> List[Dict]:
+        """Get mentions of the authenticated user newer than since_id.
+        
+        since_id defaults to the newest mention seen so far, which is kept in
+        Config.STATE_FILE across restarts.
+        """
         try:
-            params = {
-                'max_results': 5,  # Changed from 100 to 3
-                'tweet.fields': 'author_id,created_at,text,conversation_id',
-                'expansions': 'author_id',
-                'user.fields': 'username,verified'
-            }
-            
-            user_id = await self.get_user_id()
-            if not user_id:
+            if not await self.get_user_id():
                 logger.error("Could not get user ID")
                 return []
                 
-            response = await self._make_request('GET', f'/users/{user_id}/mentions', params=params)
-            
-            if response and 'data' in response:
-                mentions = response['data']
-                
-                if 'includes' in response and 'users' in response['includes']:
-                    user_map = {
-                        user['id']: {
-                            'username': user['username'],
-                            'verified': user.get('verified', False)
-                        }
-                        for user in response['includes']['users']
-                    }
-                    
-                    for mention in mentions:
-                        user_data = user_map.get(mention['author_id'], {})
-                        mention['username'] = user_data.get('username')
-                        mention['verified'] = user_data.get('verified', False)
+            # Only ask for mentions newer than the last ones we've seen
+            params = {**_MENTIONS_PARAMS, 'max_results': max_results}
+            since_id = since_id or self._last_mention_id
+            if since_id:
+                params['since_id'] = since_id
                 
-                logger.info(f"Found {len(mentions)} recent mentions")
-                return mentions
+            response = await self._request_full('GET', self._ep_mentions, params=params)
+            if not response:
+                return []
             
-            return []
+            mentions = response['data']
+            self._attach_authors(mentions, response)
+            
+            # Mentions are returned newest first
+            newest = mentions[0]['id']
+            if not self._last_mention_id or int(newest) > int(self._last_mention_id):
+                self._last_mention_id = newest
+                await self._save_state()
+            
+            logger.info("Found %d recent mentions", len(mentions))
+            return mentions
                 
         except Exception as e:
-            logger.error(f"Error getting mentions: {str(e)}")
+            logger.error("Error getting mentions: %s", e)
             return []
 
     # In twitter_client.py
-    async def get_user_tweets(self, username: str) -> List[Dict]:
-        """Get recent tweets from a specific user."""
+    async def stream_mentions(self) -> AsyncIterator[Dict]:
+        """Yield tweets from the v2 filtered stream as they are posted.
+        
+        The filtered stream only accepts app-only auth, so this needs
+        Config.TWITTER_BEARER_TOKEN and a stream rule that matches the bot's
+        mentions (e.g. "@botname"). Without a token, use get_mentions polling.
+        """
+        if not Config.TWITTER_BEARER_TOKEN:
+            logger.error("TWITTER_BEARER_TOKEN is not set - cannot open the filtered stream")
+            return
+            
+        headers = {'Authorization': f'Bearer {Config.TWITTER_BEARER_TOKEN}'}
+        
+        try:
+            # Bearer auth replaces the client's OAuth 1.0a signer for this request;
+            # streamed tweets carry the same fields as polled mentions
+            async with self._client.stream('GET', '/tweets/search/stream',
+                                           params=_MENTIONS_PARAMS, auth=lambda request: request,
+                                           headers=headers, timeout=None) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    # The stream sends blank keep-alive lines between tweets
+                    if not line.strip():
+                        continue
+                    payload = _json_loads(line)
+                    tweet = payload.get('data')
+                    if tweet:
+                        self._attach_authors([tweet], payload)
+                        yield tweet
+        except Exception as e:
+            logger.error("Error in mention stream: %s", e)
+
+    async def get_user_tweets(self, username: str, max_results: int = 100, since_id: Optional[str] = None) -> List[Dict]:
+        """Get recent tweets from a specific user.
+        
+        since_id defaults to the newest tweet returned for this user by the
+        previous call; the first call returns tweets from the last 2 hours.
+        """
         try:
             user_id = await self.get_user_id_by_username(username)
             if not user_id:
                 return []
             
-            # Calculate time 2 hours ago in ISO format
-            two_hours_ago = (datetime.now(timezone.utc) - timedelta(hours=2))
-            
-            params = {
-                'max_results': 5,
-                'tweet.fields': 'public_metrics,created_at,conversation_id',
-                'exclude': 'retweets,replies'
-            }
-            
-            response = await self._make_request('GET', f'/users/{user_id}/tweets', params=params)
-            
-            if not response or 'data' not in response:
-                return []
-                
-            # Filter tweets client-side to ensure they're within 2 hours
-            recent_tweets = []
-            for tweet in response.get('data', []):
-                created_at = datetime.fromisoformat(tweet['created_at'].replace('Z', '+00:00'))
-                if created_at > two_hours_ago:
-                    recent_tweets.append(tweet)
-                else:
-                    logger.debug(f"Filtered out tweet from {created_at} as it's older than 2 hours")
-                    
-            return recent_tweets
+            return await self._get_recent_tweets(user_id, max_results, since_id)
         except Exception as e:
-            logger.error(f"Error getting user tweets: {str(e)}")
+            logger.error("Error getting user tweets: %s", e)
             return []
 
+    async def get_many_user_tweets(self, usernames: List[str], max_results: int = 100) -> Dict[str, List[Dict]]:
+        """Get recent tweets for several users concurrently, keyed by lowercased username."""
+        try:
+            user_ids = await self.get_user_ids_by_usernames(usernames)
+            keys = list(user_ids)
+            results = await asyncio.gather(*[self._get_recent_tweets(user_ids[key], max_results) for key in keys])
+            return dict(zip(keys, results))
+        except Exception as e:
+            logger.error("Error getting tweets for users: %s", e)
+            return {}
+
+    async def _get_recent_tweets(self, user_id: str, max_results: int = 100, since_id: Optional[str] = None) -> List[Dict]:
+        """Get a user's tweets newer than since_id, or from the last 2 hours."""
+        params = {**_USER_TWEETS_PARAMS, 'max_results': max_results}
+        since_id = since_id or self._last_tweet_ids.get(user_id)
+        if since_id:
+            params['since_id'] = since_id
+        
+        tweets = await self._request_data('GET', f'/users/{user_id}/tweets', params=params)
+        if not tweets:
+            return []
+        
+        # Tweets are returned newest first
+        self._last_tweet_ids[user_id] = tweets[0]['id']
+        
+        # since_id already limits the response to new tweets
+        if since_id:
+            return tweets
+            
+        # Filter tweets client-side to ensure they're within 2 hours. The cutoff
+        # is in the API's own fixed-width UTC format, so it compares as a string
+        two_hours_ago = time.time() - 2 * 3600
+        cutoff = time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime(two_hours_ago))
+        recent_tweets = []
+        for tweet in tweets:
+            created_at = tweet['created_at']
+            if len(created_at) == len(cutoff) and created_at.endswith('Z'):
+                is_recent = created_at > cutoff
+            else:
+                is_recent = parse_twitter_timestamp(created_at) > two_hours_ago
+            if is_recent:
+                recent_tweets.append(tweet)
+            else:
+                logger.debug("Filtered out tweet from %s as it's older than 2 hours", created_at)
+                
+        return recent_tweets
+
     async def search_tweets(self, query: str, max_results: int = 50) -> List[Dict]:
         """Search for tweets matching a query."""
         try:
-            params = {
-                'query': query,
-                'max_results': max_results,
-                'tweet.fields': 'public_metrics,created_at,author_id,conversation_id',
-                'expansions': 'author_id',
-                'user.fields': 'username,verified'
-            }
-            
-            response = await self._make_request('GET', '/tweets/search/recent', params=params)
+            params = {**_SEARCH_PARAMS, 'query': query, 'max_results': max_results}
             
-            if response and 'data' in response:
-                tweets = response['data']
-                
-                if 'includes' in response and 'users' in response['includes']:
-                    user_map = {
-                        user['id']: {
-                            'username': user['username'],
-                            'verified': user.get('verified', False)
-                        }
-                        for user in response['includes']['users']
-                    }
-                    
-                    for tweet in tweets:
-                        user_data = user_map.get(tweet['author_id'], {})
-                        tweet['username'] = user_data.get('username')
-                        tweet['verified'] = user_data.get('verified', False)
-                
-                return tweets
+            response = await self._request_full('GET', '/tweets/search/recent', params=params)
+            if not response:
+                return []
             
-            return []
+            tweets = response['data']
+            self._attach_authors(tweets, response)
+            return tweets
             
         except Exception as e:
-            logger.error(f"Error searching tweets: {str(e)}")
+            logger.error("Error searching tweets: %s", e)
             return []
 
     async def like_tweet(self, tweet_id: str) -> bool:
         """Like a specific tweet."""
         try:
-            user_id = await self.get_user_id()
-            if not user_id:
+            if not await self.get_user_id():
                 return False
                 
             data = {
                 'tweet_id': tweet_id
             }
-            response = await self._make_request('POST', f'/users/{user_id}/likes', data=data)
-            return bool(response and 'data' in response)
+            return await self._request_data('POST', self._ep_likes, data=data) is not None
         except Exception as e:
-            logger.error(f"Error liking tweet: {str(e)}")
+            logger.error("Error liking tweet: %s", e)
             return False
 
     async def unlike_tweet(self, tweet_id: str) -> bool:
         """Remove a like from a tweet."""
         try:
-            user_id = await self.get_user_id()
-            if not user_id:
+            if not await self.get_user_id():
                 return False
                 
-            response = await self._make_request('DELETE', f'/users/{user_id}/likes/{tweet_id}')
-            return bool(response and 'data' in response)
+            return await self._request_data('DELETE', self._ep_likes + '/' + tweet_id) is not None
         except Exception as e:
-            logger.error(f"Error unliking tweet: {str(e)}")
+            logger.error("Error unliking tweet: %s", e)
             return False
\ No newline at end of file